@@ -1,9 +1,8 @@
 from dbutils.pooled_db import PooledDB
-import threading
 import time as _time
 import persistqueue
 from .sqlbase import SQLBase
-from typing import Any, Optional
+from typing import Any, Iterable, List, Optional, Tuple
 
 
 class MySQLQueue(SQLBase):
@@ -20,7 +19,7 @@ class MySQLQueue(SQLBase):
     # SQL to select a record
     _SQL_SELECT_ID = (
         'SELECT {key_column}, data, timestamp FROM {table_name} WHERE'
-        ' {key_column} = {rowid}'
+        ' {key_column} = %s'
     )
     _SQL_SELECT = (
         'SELECT {key_column}, data, timestamp FROM {table_name} '
@@ -32,6 +31,7 @@ class MySQLQueue(SQLBase):
     )
     _SQL_UPDATE = 'UPDATE {table_name} SET data = %s WHERE {key_column} = %s'
     _SQL_DELETE = 'DELETE FROM {table_name} WHERE {key_column} {op} %s'
+    _IS_POOLED_DB = True
 
     def __init__(
         self,
@@ -44,6 +44,7 @@ class MySQLQueue(SQLBase):
         charset: str = 'utf8mb4',
         auto_commit: bool = True,
         serializer: Any = persistqueue.serializers.pickle,
+        connection_pool: Optional[Any] = None,
     ) -> None:
         super(MySQLQueue, self).__init__()
         self.name = name if name else "sql"
@@ -55,10 +56,8 @@ class MySQLQueue(SQLBase):
         self.charset = charset
         self._serializer = serializer
         self.auto_commit = auto_commit
-        self.tran_lock = threading.Lock()
-        self.put_event = threading.Event()
-        self.action_lock = threading.Lock()
-        self._connection_pool = None
+        # an existing pool lets several queues share their connections
+        self._connection_pool = connection_pool
         self._getter = None
         self._putter = None
         self._new_db_connection()
@@ -70,11 +69,13 @@ class MySQLQueue(SQLBase):
         except ImportError:
             print("Please install mysql library via 'pip install PyMySQL'")
             raise
-        db_pool = PooledDB(pymysql, 2, 10, 5, 10, True,
-                           host=self.host, port=self.port, user=self.user,
-                           passwd=self.passwd, database=self.db_name,
-                           charset=self.charset)
-        self._connection_pool = db_pool
+        db_pool = self._connection_pool
+        if db_pool is None:
+            db_pool = PooledDB(pymysql, 2, 10, 5, 10, True,
+                               host=self.host, port=self.port,
+                               user=self.user, passwd=self.passwd,
+                               database=self.db_name, charset=self.charset)
+            self._connection_pool = db_pool
         conn = db_pool.connection()
         cursor = conn.cursor()
         cursor.execute("SELECT VERSION()")
@@ -89,15 +90,31 @@ class MySQLQueue(SQLBase):
         # block kwarg is noop and only here to align with python's queue
         obj = self._serializer.dumps(item)
         _id = self._insert_into(obj, _time.time())
-        self.total += 1
-        self.put_event.set()
+        self._incr_total()
         return _id
 
     def put_nowait(self, item: Any) -> int:
         return self.put(item, block=False)
 
+    def put_many(self, items: Iterable[Any]) -> None:
+        """Put all the items in a single transaction."""
+        dumps = self._serializer.dumps
+        now = _time.time()
+        records = [(dumps(item), now) for item in items]
+        if records:
+            self._insert_many(records)
+            self._incr_total(len(records))
+
+    def _insert_many(self, records: List[Tuple[Any, ...]]) -> None:
+        # PyMySQL turns an executemany of an INSERT into multi-row INSERTs
+        with self.tran_lock:
+            with self.get_pooled_conn() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(self._sql_insert, records)
+                cursor.close()
+                conn.commit()
+
     def _init(self) -> None:
-        self.action_lock = threading.Lock()
         if not self.auto_commit:
             head = self._select()
             if head:
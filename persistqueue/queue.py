@@ -1,4 +1,5 @@
 """A thread-safe disk based persistent queue in Python."""
+import io
 import logging
 import os
 import tempfile
@@ -6,7 +7,7 @@ import threading
 from time import time as _time
 import persistqueue.serializers.pickle
 from persistqueue.exceptions import Empty, Full
-from typing import Any, Optional, Tuple, BinaryIO
+from typing import Any, BinaryIO, Iterable, List, Optional, Tuple
 
 log = logging.getLogger(__name__)
 
@@ -152,8 +153,43 @@ class Queue:
         finally:
             self.not_full.release()
 
+    def put_many(self, items: Iterable[Any]) -> None:
+        """Put all the items, saving the queue info only once.
+
+        A bounded queue without room for all of them raises Full.
+        """
+        items = list(items)
+        with self.not_full:
+            if self.maxsize > 0 and \
+                    self._qsize() + len(items) > self.maxsize:
+                raise Full
+            if not items:
+                return
+            # serialize all of them first, so that an item failing to
+            # serialize leaves the chunks and the info untouched
+            dumped = []
+            for item in items:
+                buf = io.BytesIO()
+                self.serializer.dump(item, buf)
+                dumped.append(buf.getvalue())
+            for data in dumped:
+                self.headf.write(data)
+                self._advance_head()
+            self._saveinfo()
+            self.unfinished_tasks += len(items)
+            self.not_empty.notify(len(items))
+
     def _put(self, item: Any) -> None:
+        self._append(item)
+        self._saveinfo()
+
+    def _append(self, item: Any) -> None:
+        """Write the item to the head chunk without saving the info."""
         self.serializer.dump(item, self.headf)
+        self._advance_head()
+
+    def _advance_head(self) -> None:
+        """Account for an item just written to the head chunk."""
         self.headf.flush()
         hnum, hpos, _ = self.info['head']
         hpos += 1
@@ -165,7 +201,6 @@ class Queue:
             self.headf = self._openchunk(hnum, 'ab+')
         self.info['size'] += 1
         self.info['head'] = [hnum, hpos, self.headf.tell()]
-        self._saveinfo()
 
     def put_nowait(self, item: Any) -> None:
         self.put(item, False)
@@ -197,7 +232,33 @@ class Queue:
     def get_nowait(self) -> Any:
         return self.get(False)
 
+    def get_many(self, n: int) -> List[Any]:
+        """Get up to `n` items at once without blocking.
+
+        An empty list is returned if the queue is empty.
+        """
+        with self.not_empty:
+            items = [self._take() for _ in range(min(n, self._qsize()))]
+            if items:
+                self._save_tail()
+                self.not_full.notify(len(items))
+        return items
+
     def _get(self) -> Any:
+        data = self._take()
+        self._save_tail()
+        return data
+
+    def _save_tail(self) -> None:
+        """Persist the tail after items were taken, if autosave is on."""
+        if self.autosave:
+            self._saveinfo()
+            self.update_info = False
+        else:
+            self.update_info = True
+
+    def _take(self) -> Any:
+        """Read the item at the tail without saving the info."""
         tnum, tcnt, toffset = self.info['tail']
         hnum, hcnt, _ = self.info['head']
         if [tnum, tcnt] >= [hnum, hcnt]:
@@ -212,11 +273,6 @@ class Queue:
             self.tailf = self._openchunk(tnum)
         self.info['size'] -= 1
         self.info['tail'] = [tnum, tcnt, toffset]
-        if self.autosave:
-            self._saveinfo()
-            self.update_info = False
-        else:
-            self.update_info = True
         return data
 
     def task_done(self) -> None:
@@ -0,0 +1,77 @@
+"""
+A serializer that uses msgspec's msgpack codec and adds a 4 byte length
+prefix to store multiple objects per file.
+
+The encoder and decoder instances are created once at import time and reused
+for every call, which avoids rebuilding them on the put/get hot path.
+"""
+import msgspec
+import struct
+from typing import Any, BinaryIO
+
+_encoder = msgspec.msgpack.Encoder()
+_sorted_encoder = msgspec.msgpack.Encoder(order='sorted')
+_decoder = msgspec.msgpack.Decoder()
+
+
+def dump(value: Any, fp: BinaryIO, sort_keys: bool = False) -> None:
+    """
+    Serialize value as msgpack to a byte-mode file object with a length prefix.
+
+    Args:
+        value: The Python object to serialize.
+        fp: A file-like object supporting binary write operations.
+        sort_keys: If True, the output of dictionaries will be sorted by key.
+
+    Returns:
+        None
+    """
+    packed = dumps(value, sort_keys=sort_keys)
+    length = struct.pack("<L", len(packed))
+    fp.write(length)
+    fp.write(packed)
+
+
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize value as msgpack to bytes.
+
+    Args:
+        value: The Python object to serialize.
+        sort_keys: If True, the output of dictionaries will be sorted by key.
+
+    Returns:
+        A bytes object containing the serialized representation of value.
+    """
+    if sort_keys:
+        return _sorted_encoder.encode(value)
+    return _encoder.encode(value)
+
+
+def load(fp: BinaryIO) -> Any:
+    """
+    Deserialize one msgpack value from a byte-mode file object using length
+    prefix.
+
+    Args:
+        fp: A file-like object supporting binary read operations.
+
+    Returns:
+        The deserialized Python object.
+    """
+    length = struct.unpack("<L", fp.read(4))[0]
+    return _decoder.decode(fp.read(length))
+
+
+def loads(bytes_value: bytes) -> Any:
+    """
+    Deserialize one msgpack value from bytes.
+
+    Args:
+        bytes_value: A bytes-like object containing the serialized msgpack
+                     data.
+
+    Returns:
+        The deserialized Python object.
+    """
+    return _decoder.decode(bytes_value)
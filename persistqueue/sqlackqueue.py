@@ -1,14 +1,13 @@
 import logging
 import sqlite3
 import time as _time
-import threading
 import warnings
-from typing import Any, Dict, Optional, Tuple
+from functools import cached_property
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 from . import sqlbase
 from .exceptions import Empty
 
-sqlite3.enable_callback_tracebacks(True)
 log = logging.getLogger(__name__)
 
 # 10 seconds interval for `wait` of event
@@ -39,14 +38,16 @@ class SQLiteAckQueue(sqlbase.SQLiteBase):
         'INSERT INTO {table_name} (data, timestamp, status)'
         ' VALUES (?, ?, %s)' % AckStatus.inited
     )
+    # `_SQL_SELECT` starts after the rowid bound as its first parameter
+    _SELECT_BINDS_ROWID = True
     # SQL to select a record
     _SQL_SELECT_ID = (
         'SELECT {key_column}, data, timestamp, status FROM {table_name} WHERE'
-        ' {key_column} = {rowid}'
+        ' {key_column} = ?'
     )
     _SQL_SELECT = (
         'SELECT {key_column}, data, timestamp, status FROM {table_name} '
-        'WHERE {key_column} > {rowid} AND status < %s '
+        'WHERE {key_column} > ? AND status < %s '
         'ORDER BY {key_column} ASC LIMIT 1' % AckStatus.unack
     )
     _SQL_MARK_ACK_UPDATE = (
@@ -54,7 +55,7 @@ class SQLiteAckQueue(sqlbase.SQLiteBase):
     )
     _SQL_SELECT_WHERE = (
         'SELECT {key_column}, data, timestamp FROM {table_name}'
-        ' WHERE {key_column} > {rowid} AND status < %s AND'
+        ' WHERE {key_column} > ? AND status < %s AND'
         ' {column} {op} ? ORDER BY {key_column} ASC'
         ' LIMIT 1 ' % AckStatus.unack
     )
@@ -83,27 +84,34 @@ class SQLiteAckQueue(sqlbase.SQLiteBase):
     def put(self, item: Any) -> Optional[int]:
         obj = self._serializer.dumps(item)
         _id = self._insert_into(obj, _time.time())
-        self.total += 1
-        self.put_event.set()
+        self._incr_total()
         return _id
 
+    def put_many(self, items: Iterable[Any]) -> None:
+        """Put all the items in a single transaction."""
+        dumps = self._serializer.dumps
+        now = _time.time()
+        records = [(dumps(item), now) for item in items]
+        if records:
+            self._insert_many(records)
+            self._incr_total(len(records))
+
     def _init(self) -> None:
         super(SQLiteAckQueue, self)._init()
-        self.action_lock = threading.Lock()
         self.total = self._count()
 
     def _count(self) -> int:
-        sql = 'SELECT COUNT({}) FROM {} WHERE status < ?'.format(
-            self._key_column, self._table_name
-        )
-        row = self._getter.execute(sql, (AckStatus.unack,)).fetchone()
+        with self._acquire_reader() as reader:
+            row = reader.execute(
+                self._sql_count, (AckStatus.unack,)
+            ).fetchone()
         return row[0] if row else 0
 
     def _ack_count_via_status(self, status: str) -> int:
-        sql = 'SELECT COUNT({}) FROM {} WHERE status = ?'.format(
-            self._key_column, self._table_name
-        )
-        row = self._getter.execute(sql, (status,)).fetchone()
+        with self._acquire_reader() as reader:
+            row = reader.execute(
+                self._sql_count_by_status, (status,)
+            ).fetchone()
         return row[0] if row else 0
 
     def unack_count(self) -> int:
@@ -118,11 +126,11 @@ class SQLiteAckQueue(sqlbase.SQLiteBase):
     def ack_failed_count(self) -> int:
         return self._ack_count_via_status(AckStatus.ack_failed)
 
-    @sqlbase.with_conditional_transaction
+    @sqlbase.with_sqlite_transaction
     def _mark_ack_status(self, key: int, status: str) -> None:
         return self._sql_mark_ack_status, (status, key,)
 
-    @sqlbase.with_conditional_transaction
+    @sqlbase.with_sqlite_transaction
     def clear_acked_data(
         self, max_delete: int = 1000, keep_latest: int = 1000,
         clear_ack_failed: bool = False
@@ -159,27 +167,40 @@ class SQLiteAckQueue(sqlbase.SQLiteBase):
         )
         return sql, AckStatus.acked
 
-    @property
+    @cached_property
     def _sql_mark_ack_status(self) -> str:
         return self._SQL_MARK_ACK_UPDATE.format(
             table_name=self._table_name, key_column=self._key_column
         )
 
+    @cached_property
+    def _sql_count(self) -> str:
+        return 'SELECT COUNT({}) FROM {} WHERE status < ?'.format(
+            self._key_column, self._table_name
+        )
+
+    @cached_property
+    def _sql_count_by_status(self) -> str:
+        return 'SELECT COUNT({}) FROM {} WHERE status = ?'.format(
+            self._key_column, self._table_name
+        )
+
     def _pop(self, rowid: Optional[int] = None, next_in_order: bool = False,
              raw: bool = False) -> Optional[Dict[str, Any]]:
-        with self.action_lock:
-            row = self._select(next_in_order=next_in_order, rowid=rowid)
-            if row and row[0] is not None:
-                self._mark_ack_status(row[0], AckStatus.unack)
-                serialized_data = row[1]
-                item = self._serializer.loads(serialized_data)
-                self._unack_cache[row[0]] = item
-                self.total -= 1
-                if raw:
-                    return {'pqid': row[0], 'data': item, 'timestamp': row[2]}
-                else:
-                    return item
-            return None
+        """Pop the next record, must be called with `action_lock` held."""
+        self._flush_for_read()
+        row = self._select(next_in_order=next_in_order, rowid=rowid)
+        if row and row[0] is not None:
+            self._mark_ack_status(row[0], AckStatus.unack)
+            serialized_data = row[1]
+            item = self._serializer.loads(serialized_data)
+            self._unack_cache[row[0]] = item
+            self.total -= 1
+            if raw:
+                return {'pqid': row[0], 'data': item, 'timestamp': row[2]}
+            else:
+                return item
+        return None
 
     def _find_item_id(self, item: Any, search: bool = True) -> Optional[int]:
         if item is None:
@@ -245,6 +266,8 @@ class SQLiteAckQueue(sqlbase.SQLiteBase):
             if _id in self._unack_cache:
                 self._unack_cache.pop(_id)
             self.total += 1
+            if self._get_waiters:
+                self.put_cv.notify()
         return _id
 
     def update(self, item: Any, id: Optional[int] = None) -> Optional[int]:
@@ -271,61 +294,63 @@ class SQLiteAckQueue(sqlbase.SQLiteBase):
             )
         if next_in_order and not isinstance(next_in_order, bool):
             raise ValueError("'next_in_order' must be a boolean (True/False)")
-        if not block:
-            serialized = self._pop(
-                next_in_order=next_in_order, raw=raw, rowid=rowid
-            )
-            if serialized is None:
-                raise Empty
-        elif timeout is None:
-            # block until a put event.
-            serialized = self._pop(
-                next_in_order=next_in_order, raw=raw, rowid=rowid
-            )
-            while serialized is None:
-                self.put_event.clear()
-                self.put_event.wait(TICK_FOR_WAIT)
+        if block and timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        with self.action_lock:
+            if not block:
                 serialized = self._pop(
                     next_in_order=next_in_order, raw=raw, rowid=rowid
                 )
-        elif timeout < 0:
-            raise ValueError("'timeout' must be a non-negative number")
-        else:
-            # block until the timeout reached
-            endtime = _time.time() + timeout
-            serialized = self._pop(
-                next_in_order=next_in_order, raw=raw, rowid=rowid
-            )
-            while serialized is None:
-                self.put_event.clear()
-                remaining = endtime - _time.time()
-                if remaining <= 0.0:
+                if serialized is None:
                     raise Empty
-                self.put_event.wait(
-                    TICK_FOR_WAIT if TICK_FOR_WAIT < remaining else remaining
+            elif timeout is None:
+                # block until a put notification, still poll every
+                # `_WAIT_TICK` for items put by other processes.
+                serialized = self._pop(
+                    next_in_order=next_in_order, raw=raw, rowid=rowid
                 )
+                while serialized is None:
+                    if self._wait_for_put(self._WAIT_TICK):
+                        serialized = self._pop(
+                            next_in_order=next_in_order, raw=raw, rowid=rowid
+                        )
+            else:
+                # block until the timeout reached
+                endtime = _time.time() + timeout
                 serialized = self._pop(
                     next_in_order=next_in_order, raw=raw, rowid=rowid
                 )
+                while serialized is None:
+                    remaining = endtime - _time.time()
+                    if remaining <= 0.0:
+                        raise Empty
+                    if self._wait_for_put(min(self._WAIT_TICK, remaining)):
+                        serialized = self._pop(
+                            next_in_order=next_in_order, raw=raw, rowid=rowid
+                        )
         return serialized
 
     def task_done(self) -> None:
         """Persist the current state if auto_commit=False."""
+        self.flush()
         if not self.auto_commit:
             self._task_done()
 
-    def queue(self) -> Any:
-        rows = self._sql_queue()
-        datarows = []
-        for row in rows:
-            item = {
-                'id': row[0],
-                'data': self._serializer.loads(row[1]),
-                'timestamp': row[2],
-                'status': row[3],
-            }
-            datarows.append(item)
-        return datarows
+    def iter_queue(self) -> Iterator[Dict[str, Any]]:
+        loads = self._serializer.loads
+        with self._acquire_reader() as reader:
+            cur = reader.execute(self._sql_select_all)
+            while True:
+                rows = cur.fetchmany(self._QUEUE_FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield {
+                        'id': row[0],
+                        'data': loads(row[1]),
+                        'timestamp': row[2],
+                        'status': row[3],
+                    }
 
     @property
     def size(self) -> int:
@@ -356,7 +381,7 @@ class FILOSQLiteAckQueue(SQLiteAckQueue):
     # SQL to select a record
     _SQL_SELECT = (
         'SELECT {key_column}, data, timestamp, status FROM {table_name} '
-        'WHERE {key_column} < {rowid} and status < %s '
+        'WHERE {key_column} < ? and status < %s '
         'ORDER BY {key_column} DESC LIMIT 1' % AckStatus.unack
     )
 
@@ -377,6 +402,13 @@ class UniqueAckQ(SQLiteAckQueue):
         except sqlite3.IntegrityError:
             pass
         else:
-            self.total += 1
-            self.put_event.set()
+            self._incr_total()
         return _id
+
+    def put_many(self, items: Iterable[Any]) -> None:
+        """Put the items in a single transaction, skipping duplicates."""
+        dumps = self._serializer.dumps
+        now = _time.time()
+        records = [(dumps(item, sort_keys=True), now) for item in items]
+        if records:
+            self._incr_total(self._insert_many(records, or_ignore=True))
@@ -1,14 +1,23 @@
 import logging
 import os
+import queue as _queue
 import time as _time
 import sqlite3
 import threading
-from typing import Any, Callable, Tuple, Optional
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Optional
+from urllib.parse import quote
 
 from persistqueue.exceptions import Empty
 import persistqueue.serializers.pickle
 
-sqlite3.enable_callback_tracebacks(True)
+# print the tracebacks of exceptions raised in sqlite3 callbacks, only meant
+# for debugging
+if os.environ.get('PERSISTQUEUE_DEBUG'):
+    sqlite3.enable_callback_tracebacks(True)
 log = logging.getLogger(__name__)
 
 # 10 seconds interval for `wait` of event
@@ -20,7 +29,7 @@ def with_conditional_transaction(func: Callable) -> Callable:
         # for MySQL, connection pool should be used since db connection is
         # basically not thread-safe
         _putter = obj._putter
-        if str(type(obj)).find("MySQLQueue") > 0:
+        if obj._IS_POOLED_DB:
             # use fresh connection from pool not the shared one
             _putter = obj.get_pooled_conn()
         with obj.tran_lock:
@@ -28,8 +37,7 @@ def with_conditional_transaction(func: Callable) -> Callable:
                 # For sqlite3, commit() is called automatically afterwards
                 # but for other db API, this is not TRUE!
                 stat, param = func(obj, *args, **kwargs)
-                s = str(type(tran))
-                if s.find("Cursor") > 0:
+                if obj._RETURNS_CURSOR_CTX:
                     cur = tran
                     cur.execute(stat, param)
                 else:
@@ -42,6 +50,54 @@ def with_conditional_transaction(func: Callable) -> Callable:
     return _execute
 
 
+def with_sqlite_transaction(func: Callable) -> Callable:
+    """Like `with_conditional_transaction`, specialized for sqlite3.
+
+    The statement runs on the cursor kept open on `_putter`, guarded by
+    `tran_lock`, and the connection context commits it.
+    """
+    def _execute(obj: 'SQLiteBase', *args: Any, **kwargs: Any) -> Any:
+        with obj.tran_lock:
+            with obj._putter:
+                stat, param = func(obj, *args, **kwargs)
+                cur = obj._putter_cursor
+                cur.execute(stat, param)
+                return cur.lastrowid
+
+    return _execute
+
+
+def _commit_periodically(queue_ref: 'weakref.ref[SQLiteBase]',
+                         stop: threading.Event, interval: float) -> None:
+    """Flush the pending puts of a queue every `interval` seconds.
+
+    Only a weak reference to the queue is held, so dropping the queue
+    still triggers its `__del__` and ends this loop.
+    """
+    while not stop.wait(interval):
+        queue = queue_ref()
+        if queue is None:
+            return
+        queue.flush()
+        del queue
+
+
+def _write_buffered_puts(queue_ref: 'weakref.ref[SQLiteBase]',
+                         wakeup: threading.Event,
+                         stop: threading.Event) -> None:
+    """Write the buffered puts of a queue to the db whenever woken up."""
+    while True:
+        wakeup.wait()
+        if stop.is_set():
+            return
+        wakeup.clear()
+        queue = queue_ref()
+        if queue is None:
+            return
+        queue.flush()
+        del queue
+
+
 def commit_ignore_error(conn: sqlite3.Connection) -> None:
     """Ignore the error of no transaction is active.
 
@@ -73,22 +129,44 @@ class SQLBase(object):
     _SQL_SELECT_ID = ''  # SQL to select a record with criteria
     _SQL_SELECT_WHERE = ''  # SQL to select a record with criteria
     _SQL_DELETE = ''  # SQL to delete a record
+    # whether `_SQL_SELECT` and `_SQL_SELECT_WHERE` take the start rowid as
+    # their first parameter
+    _SELECT_BINDS_ROWID = False
+    # whether the writes run on a fresh connection from `get_pooled_conn`
+    _IS_POOLED_DB = False
+    # whether entering the connection context yields a cursor rather than
+    # the connection itself
+    _RETURNS_CURSOR_CTX = False
+    _QUEUE_FETCH_SIZE = 1024  # rows fetched per batch by `iter_queue`
+    # seconds a blocked `get` waits before checking for items put by
+    # other processes
+    _WAIT_TICK = TICK_FOR_WAIT
 
     def __init__(self) -> None:
         self._serializer = persistqueue.serializers.pickle
         self.auto_commit = True  # Transaction commit behavior
         # SQL transaction lock
         self.tran_lock = threading.Lock()
-        # Event signaling new data
-        self.put_event = threading.Event()
-        # Lock for atomic actions
-        self.action_lock = threading.Lock()
+        # Lock for atomic actions, re-entrant so that a pop holding it can
+        # write the buffered puts, which notifies `put_cv`
+        self.action_lock = threading.RLock()
+        # Condition signaling new data, consumers wait on it in `get`. It is
+        # used while holding `action_lock` directly, which skips the Python
+        # level `Condition.__enter__`/`__exit__` on every put and get.
+        self.put_cv = threading.Condition(self.action_lock)
+        # Number of consumers waiting on `put_cv`, guarded by `action_lock`
+        # so that puts can skip the notify when nobody waits
+        self._get_waiters = 0
         self.total = 0  # Total tasks
         self.cursor = 0  # Cursor for task processing
         # Connection for getting tasks
         self._getter = None
         # Connection for putting tasks
         self._putter = None
+        # Formatted DELETE statements keyed by the comparison operator
+        self._sql_delete_by_op: Dict[str, str] = {}
+        # Formatted SELECT ... WHERE statements keyed by (op, column)
+        self._sql_select_where_by_op: Dict[Tuple[str, str], str] = {}
 
     @with_conditional_transaction
     def _insert_into(self, *record: Any) -> Tuple[str, Tuple[Any, ...]]:
@@ -101,47 +179,43 @@ class SQLBase(object):
 
     @with_conditional_transaction
     def _delete(self, key: Any, op: str = '=') -> Tuple[str, Tuple[Any, ...]]:
+        return self._sql_delete(op), (key,)
+
+    def _pop(self, rowid: Optional[int] = None, raw: bool = False,
+             decode: bool = True) -> Optional[Any]:
+        """Pop the next record, must be called with `action_lock` held."""
+        if self.auto_commit:
+            row = self._select(rowid=rowid)
+            # Perhaps a sqlite3 bug, sometimes (None, None) is returned
+            # by select, below can avoid these invalid records.
+            if row and row[0] is not None:
+                self._delete(row[0])
+                self.total -= 1
+                return self._load_row(row, raw, decode)
+        else:
+            row = self._select(
+                self.cursor, op=">", column=self._KEY_COLUMN, rowid=rowid
+            )
+            if row and row[0] is not None:
+                self.cursor = row[0]
+                self.total -= 1
+                return self._load_row(row, raw, decode)
+        return None
 
-        sql = self._SQL_DELETE.format(
-            table_name=self._table_name, key_column=self._key_column, op=op)
-        return sql, (key,)
+    def _load_row(self, row: Tuple[Any, ...], raw: bool = False,
+                  decode: bool = True) -> Any:
+        """Deserialize a (id, data, timestamp) row fetched from the table.
 
-    def _pop(self, rowid: Optional[int] = None, raw: bool = False
-             ) -> Optional[Any]:
-        with self.action_lock:
-            if self.auto_commit:
-                row = self._select(rowid=rowid)
-                # Perhaps a sqlite3 bug, sometimes (None, None) is returned
-                # by select, below can avoid these invalid records.
-                if row and row[0] is not None:
-                    self._delete(row[0])
-                    self.total -= 1
-                    item = self._serializer.loads(row[1])
-                    if raw:
-                        return {
-                            'pqid': row[0],
-                            'data': item,
-                            'timestamp': row[2],
-                        }
-                    else:
-                        return item
-            else:
-                row = self._select(
-                    self.cursor, op=">", column=self._KEY_COLUMN, rowid=rowid
-                )
-                if row and row[0] is not None:
-                    self.cursor = row[0]
-                    self.total -= 1
-                    item = self._serializer.loads(row[1])
-                    if raw:
-                        return {
-                            'pqid': row[0],
-                            'data': item,
-                            'timestamp': row[2],
-                        }
-                    else:
-                        return item
-            return None
+        With `decode=False` the stored bytes are returned as they are.
+        """
+        item = self._serializer.loads(row[1]) if decode else row[1]
+        if raw:
+            return {
+                'pqid': row[0],
+                'data': item,
+                'timestamp': row[2],
+            }
+        return item
 
     def update(self, item: Any, id: Optional[int] = None) -> int:
         if isinstance(item, dict) and "pqid" in item:
@@ -158,66 +232,104 @@ class SQLBase(object):
     def get(self, block: bool = True, timeout: Optional[float] = None,
             id: Optional[int] = None, raw: bool = False
             ) -> Any:
+        return self._get(block, timeout, self._get_rowid(id), raw)
+
+    @staticmethod
+    def _get_rowid(id: Any) -> Optional[int]:
+        """Find the rowid in the `id` argument of `get`."""
         if isinstance(id, dict) and "pqid" in id:
-            rowid = id.get("pqid")
+            return id.get("pqid")
         elif isinstance(id, int):
-            rowid = id
-        else:
-            rowid = None
-        if not block:
-            serialized = self._pop(raw=raw, rowid=rowid)
-            if serialized is None:
-                raise Empty
-        elif timeout is None:
-            # block until a put event.
-            serialized = self._pop(raw=raw, rowid=rowid)
-            while serialized is None:
-                self.put_event.clear()
-                self.put_event.wait(TICK_FOR_WAIT)
-                serialized = self._pop(raw=raw, rowid=rowid)
-        elif timeout < 0:
+            return id
+        return None
+
+    def _get(self, block: bool, timeout: Optional[float],
+             rowid: Optional[int], raw: bool, decode: bool = True) -> Any:
+        if block and timeout is not None and timeout < 0:
             raise ValueError("'timeout' must be a non-negative number")
-        else:
-            # block until the timeout reached
-            endtime = _time.time() + timeout
-            serialized = self._pop(raw=raw, rowid=rowid)
-            while serialized is None:
-                self.put_event.clear()
-                remaining = endtime - _time.time()
-                if remaining <= 0.0:
+        with self.action_lock:
+            if not block:
+                serialized = self._pop(rowid, raw, decode)
+                if serialized is None:
                     raise Empty
-                self.put_event.wait(
-                    TICK_FOR_WAIT if TICK_FOR_WAIT < remaining else remaining
-                )
-                serialized = self._pop(raw=raw, rowid=rowid)
+            elif timeout is None:
+                # block until a put notification, still poll every
+                # `_WAIT_TICK` for items put by other processes.
+                serialized = self._pop(rowid, raw, decode)
+                while serialized is None:
+                    if self._wait_for_put(self._WAIT_TICK):
+                        serialized = self._pop(rowid, raw, decode)
+            else:
+                # block until the timeout reached
+                endtime = _time.time() + timeout
+                serialized = self._pop(rowid, raw, decode)
+                while serialized is None:
+                    remaining = endtime - _time.time()
+                    if remaining <= 0.0:
+                        raise Empty
+                    if self._wait_for_put(min(self._WAIT_TICK, remaining)):
+                        serialized = self._pop(rowid, raw, decode)
         return serialized
 
     def get_nowait(self, id: Optional[int] = None, raw: bool = False) -> Any:
         return self.get(block=False, id=id, raw=raw)
 
+    def _wait_for_put(self, timeout: float) -> bool:
+        """Wait for a put, must be called with `action_lock` held.
+
+        Returns whether an item may have been put meanwhile, either by this
+        queue or by another connection to the same database.
+        """
+        self._get_waiters += 1
+        try:
+            notified = self.put_cv.wait(timeout)
+        finally:
+            self._get_waiters -= 1
+        return notified or self._data_changed()
+
+    def _data_changed(self) -> bool:
+        """Whether another connection may have changed the data."""
+        return True
+
     def task_done(self) -> None:
         """Persist the current state if auto_commit=False."""
         if not self.auto_commit:
             self._delete(self.cursor, op='<=')
             self._task_done()
 
+    def iter_queue(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the records in the queue, fetched in batches."""
+        loads = self._serializer.loads
+        with self._acquire_reader() as reader:
+            cur = reader.execute(self._sql_select_all)
+            while True:
+                rows = cur.fetchmany(self._QUEUE_FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield {
+                        'id': row[0],
+                        'data': loads(row[1]),
+                        'timestamp': row[2],
+                    }
+
     def queue(self) -> Any:
-        rows = self._sql_queue().fetchall()
-        datarows = []
-        for row in rows:
-            item = {
-                'id': row[0],
-                'data': self._serializer.loads(row[1]),
-                'timestamp': row[2],
-            }
-            datarows.append(item)
-        return datarows
+        return list(self.iter_queue())
 
     @with_conditional_transaction
     def shrink_disk_usage(self) -> Tuple[str, Tuple[()]]:
         sql = """VACUUM"""
         return sql, ()
 
+    def _incr_total(self, count: int = 1) -> None:
+        # shares the lock with `_pop` which decrements `total`, so that
+        # concurrent puts and gets can not lose an update of the counter
+        with self.action_lock:
+            self.total += count
+            # wake up one waiting consumer per new item
+            if self._get_waiters:
+                self.put_cv.notify(count)
+
     @property
     def size(self) -> int:
         return self.total
@@ -242,36 +354,29 @@ class SQLBase(object):
         rowid = kwargs.get('rowid') if kwargs.get('rowid', None) else start_key
         if not next_in_order and rowid != start_key:
             # Get the record by the id
-            result = self._getter.execute(
-                self._sql_select_id(rowid), args
-            ).fetchone()
-        elif op and column:
-            # Get the next record with criteria
-            rowid = rowid if next_in_order else start_key
-            result = self._getter.execute(
-                self._sql_select_where(rowid, op, column), args
-            ).fetchone()
+            stmt, params = self._sql_select_id, (rowid,)
         else:
-            # Get the next record
-            rowid = rowid if next_in_order else start_key
-            result = self._getter.execute(
-                self._sql_select(rowid), args
-            ).fetchone()
-        if (
-                next_in_order
-                and rowid != start_key
-                and (not result or len(result) == 0)
-        ):
-            # sqlackqueue: if we're at the end, start over
-            kwargs['rowid'] = start_key
-            result = self._select(*args, **kwargs)
+            if not next_in_order:
+                rowid = start_key
+            if op and column:
+                # Get the next record with criteria
+                stmt = self._sql_select_where(op, column)
+            else:
+                # Get the next record
+                stmt = self._sql_select
+            params = (rowid,) + args if self._SELECT_BINDS_ROWID else args
+        with self._acquire_reader() as reader:
+            result = reader.execute(stmt, params).fetchone()
+            if not result and next_in_order and rowid != start_key:
+                # sqlackqueue: if we're at the end, start over
+                if self._SELECT_BINDS_ROWID:
+                    params = (start_key,) + args
+                result = reader.execute(stmt, params).fetchone()
         return result
 
     def _count(self) -> int:
-        sql = 'SELECT COUNT({}) FROM {}'.format(
-            self._key_column, self._table_name
-        )
-        row = self._getter.execute(sql).fetchone()
+        with self._acquire_reader() as reader:
+            row = reader.execute(self._sql_count).fetchone()
         return row[0] if row else 0
 
     def _start_key(self) -> int:
@@ -284,11 +389,15 @@ class SQLBase(object):
         """Only required if auto-commit is set as False."""
         commit_ignore_error(self._putter)
 
-    def _sql_queue(self) -> Any:
-        sql = 'SELECT * FROM {}'.format(self._table_name)
-        return self._getter.execute(sql)
+    @contextmanager
+    def _acquire_reader(self) -> Iterator[Any]:
+        """Provide a connection to run read-only statements on."""
+        yield self._getter
 
-    @property
+    # The statements below only depend on the table name and key column,
+    # so they are formatted on first access and then served from the
+    # instance dict.
+    @cached_property
     def _table_name(self) -> str:
         return '`{}_{}`'.format(self._TABLE_NAME, self.name)
 
@@ -296,46 +405,72 @@ class SQLBase(object):
     def _key_column(self) -> str:
         return self._KEY_COLUMN
 
-    @property
+    @cached_property
     def _sql_create(self) -> str:
         return self._SQL_CREATE.format(
             table_name=self._table_name, key_column=self._key_column
         )
 
-    @property
+    @cached_property
     def _sql_insert(self) -> str:
         return self._SQL_INSERT.format(
             table_name=self._table_name, key_column=self._key_column
         )
 
-    @property
+    @cached_property
+    def _sql_insert_or_ignore(self) -> str:
+        return self._sql_insert.replace('INSERT', 'INSERT OR IGNORE', 1)
+
+    @cached_property
     def _sql_update(self) -> str:
         return self._SQL_UPDATE.format(
             table_name=self._table_name, key_column=self._key_column
         )
 
-    def _sql_select_id(self, rowid) -> str:
+    @cached_property
+    def _sql_count(self) -> str:
+        return 'SELECT COUNT({}) FROM {}'.format(
+            self._key_column, self._table_name
+        )
+
+    @cached_property
+    def _sql_select_all(self) -> str:
+        return 'SELECT * FROM {}'.format(self._table_name)
+
+    def _sql_delete(self, op: str) -> str:
+        sql = self._sql_delete_by_op.get(op)
+        if sql is None:
+            sql = self._SQL_DELETE.format(
+                table_name=self._table_name,
+                key_column=self._key_column,
+                op=op,
+            )
+            self._sql_delete_by_op[op] = sql
+        return sql
+
+    @cached_property
+    def _sql_select_id(self) -> str:
         return self._SQL_SELECT_ID.format(
-            table_name=self._table_name,
-            key_column=self._key_column,
-            rowid=rowid,
+            table_name=self._table_name, key_column=self._key_column
         )
 
-    def _sql_select(self, rowid) -> str:
+    @cached_property
+    def _sql_select(self) -> str:
         return self._SQL_SELECT.format(
-            table_name=self._table_name,
-            key_column=self._key_column,
-            rowid=rowid,
+            table_name=self._table_name, key_column=self._key_column
         )
 
-    def _sql_select_where(self, rowid, op, column) -> str:
-        return self._SQL_SELECT_WHERE.format(
-            table_name=self._table_name,
-            key_column=self._key_column,
-            rowid=rowid,
-            op=op,
-            column=column,
-        )
+    def _sql_select_where(self, op: str, column: str) -> str:
+        sql = self._sql_select_where_by_op.get((op, column))
+        if sql is None:
+            sql = self._SQL_SELECT_WHERE.format(
+                table_name=self._table_name,
+                key_column=self._key_column,
+                op=op,
+                column=column,
+            )
+            self._sql_select_where_by_op[(op, column)] = sql
+        return sql
 
     def __del__(self) -> None:
         """Handles sqlite connection when queue was deleted"""
@@ -357,12 +492,47 @@ class SQLiteBase(SQLBase):
     _SQL_SELECT_WHERE = ''  # SQL to select a record with criteria
     _SQL_DELETE = ''  # SQL to delete a record
     _MEMORY = ':memory:'  # flag indicating store DB in memory
+    # checking for commits of other connections is a cheap PRAGMA, so the
+    # blocked `get` of another process picks up a put within this delay
+    _WAIT_TICK = 0.1
+    # PRAGMAs executed on every new connection, in this order. `page_size`
+    # goes first since it only takes effect before the database is created.
+    _SQLITE_PRAGMAS = {
+        'page_size': 8192,
+        # lets `shrink_disk_usage` release free pages without a VACUUM
+        'auto_vacuum': 'INCREMENTAL',
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',  # safe from corruption in WAL mode
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456,  # 256MB
+        'cache_size': -65536,  # 64MB
+        'wal_autocheckpoint': 10000,
+        # deleted rows are not overwritten with zeros, builds compiled with
+        # SQLITE_SECURE_DELETE would otherwise rewrite every freed page
+        'secure_delete': 'OFF',
+    }
+    # PRAGMAs which only take effect on a new database, they are skipped
+    # for an existing one as setting `auto_vacuum` waits for a write lock
+    _SQLITE_FILE_PRAGMAS = ('page_size', 'auto_vacuum')
+    # `synchronous` settings for the `durability` levels
+    _DURABILITY_LEVELS = {'full': 'FULL', 'normal': 'NORMAL', 'off': 'OFF'}
+    # modes accepted by `checkpoint`
+    _CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+    # size of each connection's prepared statement cache, the SQL strings
+    # are formatted once per queue so every execute() hits this cache
+    _CACHED_STATEMENTS = 256
 
     def __init__(self, path: str, name: str = 'default',
                  multithreading: bool = False, timeout: float = 10.0,
                  auto_commit: bool = True,
                  serializer: Any = persistqueue.serializers.pickle,
-                 db_file_name: Optional[str] = None) -> None:
+                 db_file_name: Optional[str] = None,
+                 batch_commit_interval: float = 0,
+                 batch_commit_size: int = 1000,
+                 sqlite_pragmas: Optional[Dict[str, Any]] = None,
+                 reader_pool_size: int = 4,
+                 put_buffer_size: int = 0,
+                 durability: str = 'normal') -> None:
         """Initiate a queue in sqlite3 or memory.
 
         :param path: path for storing DB file.
@@ -385,8 +555,61 @@ class SQLiteBase(SQLBase):
                            to read multiple values.
         :param db_file_name: set the db file name of the queue data, otherwise
                              default to `data.db`
+        :param batch_commit_interval: if greater than 0, **put** no longer
+                                      commits on every call, the pending
+                                      inserts are committed together every
+                                      `batch_commit_interval` seconds, or
+                                      **flush** can be called to commit them
+                                      immediately.
+        :param batch_commit_size: commit the pending inserts as soon as this
+                                  many are accumulated, only used when
+                                  `batch_commit_interval` is set.
+        :param sqlite_pragmas: PRAGMAs to set on the db connections, e.g.
+                               `{'synchronous': 'FULL'}`, they are merged
+                               over the defaults in `_SQLITE_PRAGMAS`.
+        :param reader_pool_size: the number of read-only connections kept
+                                 for the selects of a disk-based queue
+                                 with `multithreading`, so that concurrent
+                                 readers do not share a single connection.
+                                 Set to 0 to read via one connection.
+        :param put_buffer_size: if greater than 0, **put** appends the record
+                                to an in-memory buffer and returns None
+                                instead of the id, a background thread
+                                writes the buffered records in one
+                                transaction. **put** writes them itself once
+                                `put_buffer_size` records are buffered, and
+                                **flush** writes them immediately.
+        :param durability: `full` syncs every commit to the disk, `normal`
+                           (default) may lose the last commits on a power
+                           loss but never corrupts the database in WAL mode,
+                           `off` leaves syncing to the OS, for cache-like
+                           queues that can be lost on a crash.
         """
+        if durability not in self._DURABILITY_LEVELS:
+            raise ValueError(
+                "'durability' must be one of {}".format(
+                    ', '.join(self._DURABILITY_LEVELS))
+            )
         super(SQLiteBase, self).__init__()
+        self.batch_commit_interval = batch_commit_interval
+        self.batch_commit_size = batch_commit_size
+        self.sqlite_pragmas = dict(self._SQLITE_PRAGMAS)
+        self.sqlite_pragmas['synchronous'] = (
+            self._DURABILITY_LEVELS[durability]
+        )
+        if sqlite_pragmas:
+            self.sqlite_pragmas.update(sqlite_pragmas)
+        self._pending_commits = 0
+        # Cursor kept open on `_putter` for the writes
+        self._putter_cursor = None
+        self._commit_stop = threading.Event()
+        self._commit_thread = None
+        self.put_buffer_size = put_buffer_size
+        self._put_buffer = deque()
+        self._put_wakeup = threading.Event()
+        self._writer_thread = None
+        self.reader_pool_size = reader_pool_size
+        self._readers = None
         self.memory_sql = False
         self.path = path
         self.name = name
@@ -415,37 +638,273 @@ class SQLiteBase(SQLBase):
         self._getter = self._conn
         self._putter = self._conn
 
-        self._conn.execute(self._sql_create)
-        self._conn.commit()
+        # executescript commits the CREATE right away
+        self._conn.executescript(self._sql_create)
         # Setup another session only for disk-based queue.
         if self.multithreading:
             if not self.memory_sql:
                 self._putter = self._new_db_connection(
                     self.path, self.multithreading, self.timeout
                 )
-        self._conn.text_factory = str
-        self._putter.text_factory = str
-
-        # SQLite3 transaction lock
-        self.tran_lock = threading.Lock()
-        self.put_event = threading.Event()
+                if self.reader_pool_size > 0:
+                    # read-only connections are opened on demand
+                    self._readers = _queue.SimpleQueue()
+        self._putter_cursor = self._putter.cursor()
+        self._data_version = self._read_data_version()
+
+        if self.batch_commit_interval > 0:
+            self._commit_thread = threading.Thread(
+                target=_commit_periodically,
+                args=(weakref.ref(self), self._commit_stop,
+                      self.batch_commit_interval),
+                daemon=True,
+            )
+            self._commit_thread.start()
+        if self.put_buffer_size > 0:
+            self._writer_thread = threading.Thread(
+                target=_write_buffered_puts,
+                args=(weakref.ref(self), self._put_wakeup,
+                      self._commit_stop),
+                daemon=True,
+            )
+            self._writer_thread.start()
 
-    def _new_db_connection(self, path, multithreading, timeout
-                           ) -> sqlite3.Connection:
+    def _new_db_connection(self, path, multithreading, timeout,
+                           read_only: bool = False) -> sqlite3.Connection:
         conn = None
+        # the pending or buffered inserts are written from another thread
+        check_same_thread = not (
+            multithreading or self.batch_commit_interval
+            or self.put_buffer_size
+        )
         if path == self._MEMORY:
-            conn = sqlite3.connect(path, check_same_thread=not multithreading)
+            conn = sqlite3.connect(
+                path,
+                check_same_thread=check_same_thread,
+                cached_statements=self._CACHED_STATEMENTS,
+            )
+        elif read_only:
+            conn = sqlite3.connect(
+                'file:{}?mode=ro'.format(
+                    quote(os.path.abspath(
+                        os.path.join(path, self.db_file_name)))
+                ),
+                timeout=timeout,
+                check_same_thread=check_same_thread,
+                cached_statements=self._CACHED_STATEMENTS,
+                uri=True,
+            )
         else:
             conn = sqlite3.connect(
                 '{}/{}'.format(path, self.db_file_name),
                 timeout=timeout,
-                check_same_thread=not multithreading,
+                check_same_thread=check_same_thread,
+                cached_statements=self._CACHED_STATEMENTS,
             )
-        conn.execute('PRAGMA journal_mode=WAL;')
+        new_db = not conn.execute('PRAGMA schema_version;').fetchone()[0]
+        pragmas = [
+            'PRAGMA {}={};'.format(pragma, value)
+            for pragma, value in self.sqlite_pragmas.items()
+            if new_db or pragma not in self._SQLITE_FILE_PRAGMAS
+        ]
+        if read_only:
+            pragmas.append('PRAGMA query_only=1;')
+        # one call for all of them instead of a round trip per PRAGMA
+        conn.executescript('\n'.join(pragmas))
         return conn
 
+    def _read_data_version(self) -> int:
+        return self._getter.execute('PRAGMA data_version;').fetchone()[0]
+
+    def _data_changed(self) -> bool:
+        # `data_version` changes whenever another connection commits
+        version = self._read_data_version()
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+
+    @contextmanager
+    def _acquire_reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool if there is one."""
+        if self._readers is None:
+            yield self._getter
+            return
+        try:
+            reader = self._readers.get_nowait()
+        except _queue.Empty:
+            reader = self._new_db_connection(
+                self.path, self.multithreading, self.timeout, read_only=True
+            )
+        try:
+            yield reader
+        finally:
+            if self._readers.qsize() < self.reader_pool_size:
+                self._readers.put(reader)
+            else:
+                reader.close()
+
+    def _insert_into(self, *record: Any) -> Optional[int]:
+        if self.put_buffer_size > 0:
+            self._put_buffer.append(record)
+            if len(self._put_buffer) >= self.put_buffer_size:
+                self.flush()
+            else:
+                self._put_wakeup.set()
+            return None
+        with self.tran_lock:
+            if not self.batch_commit_interval > 0:
+                with self._putter:
+                    return self._putter_cursor.execute(
+                        self._sql_insert, record
+                    ).lastrowid
+            # the INSERT implicitly opens a transaction which stays open
+            # until the batch is committed.
+            cur = self._putter_cursor.execute(self._sql_insert, record)
+            self._pending_commits += 1
+            if self._pending_commits >= self.batch_commit_size:
+                self._putter.commit()
+                self._pending_commits = 0
+            return cur.lastrowid
+
+    @with_sqlite_transaction
+    def _update(self, key: Any, *args: Any) -> Tuple[str, Tuple[Any, ...]]:
+        args = list(args) + [key]
+        return self._sql_update, args
+
+    @with_sqlite_transaction
+    def _delete(self, key: Any, op: str = '=') -> Tuple[str, Tuple[Any, ...]]:
+        return self._sql_delete(op), (key,)
+
+    def _insert_many(self, records: List[Tuple[Any, ...]],
+                     or_ignore: bool = False) -> int:
+        """Insert the records with a single executemany and commit.
+
+        With `or_ignore` the records violating a unique constraint are
+        skipped instead of failing the whole batch. Returns the number of
+        records to count in `total`.
+        """
+        if self.put_buffer_size > 0:
+            self._put_buffer.extend(records)
+            if len(self._put_buffer) >= self.put_buffer_size:
+                self.flush()
+            else:
+                self._put_wakeup.set()
+            # the rejected ones are subtracted again by `flush`
+            return len(records)
+        sql = self._sql_insert_or_ignore if or_ignore else self._sql_insert
+        with self.tran_lock:
+            # also commits the pending inserts of the current batch
+            with self._putter:
+                cur = self._putter_cursor
+                cur.executemany(sql, records)
+            self._pending_commits = 0
+            return cur.rowcount
+
+    def flush(self) -> None:
+        """Write the buffered puts and commit the pending inserts, if any."""
+        with self.tran_lock:
+            rejected = 0
+            if self._put_buffer:
+                rejected = self._write_put_buffer()
+            elif not self._pending_commits:
+                return
+            self._putter.commit()
+            self._pending_commits = 0
+        # wake up the consumers reading via another connection, they can
+        # only see the items once committed. `action_lock` is only acquired
+        # after `tran_lock` is released as `_pop` takes them the other
+        # way round.
+        with self.action_lock:
+            # the puts rejected by a unique constraint were counted already
+            self.total -= rejected
+            if self._get_waiters:
+                self.put_cv.notify_all()
+
+    def _flush_for_read(self) -> None:
+        """Make the buffered and pending puts visible to the next select.
+
+        The pending inserts of a batch can only be seen by `_putter` until
+        they are committed, so they are committed if the select runs on
+        another connection.
+        """
+        if self._put_buffer or (
+                self._pending_commits and self._getter is not self._putter):
+            self.flush()
+
+    def _write_put_buffer(self) -> int:
+        """Insert the buffered records, must be called with `tran_lock` held.
+
+        Returns the number of records rejected by a unique constraint.
+        """
+        batch = [
+            self._put_buffer.popleft() for _ in range(len(self._put_buffer))
+        ]
+        before = self._putter.total_changes
+        try:
+            self._putter_cursor.executemany(self._sql_insert, batch)
+        except sqlite3.IntegrityError:
+            # a unique queue got a duplicate, the records before it are
+            # inserted already and rejected again below.
+            for record in batch:
+                try:
+                    self._putter_cursor.execute(self._sql_insert, record)
+                except sqlite3.IntegrityError:
+                    pass
+        return len(batch) - (self._putter.total_changes - before)
+
+    def checkpoint(self, mode: str = 'TRUNCATE') -> None:
+        """Checkpoint the WAL file into the database.
+
+        :param mode: the `wal_checkpoint` mode, `TRUNCATE` also truncates
+                     the WAL file to zero bytes.
+        """
+        if mode not in self._CHECKPOINT_MODES:
+            raise ValueError(
+                "'mode' must be one of {}".format(
+                    ', '.join(self._CHECKPOINT_MODES))
+            )
+        self.flush()
+        with self.tran_lock:
+            self._putter.execute(
+                'PRAGMA wal_checkpoint({});'.format(mode)
+            ).fetchall()
+
+    def shrink_disk_usage(self) -> None:
+        """Release the free pages of the database and truncate the WAL.
+
+        Databases created before `auto_vacuum=INCREMENTAL` was the default
+        are switched over and rebuilt with a `VACUUM` on the first call.
+        """
+        self.flush()
+        with self.tran_lock:
+            mode = self._putter.execute('PRAGMA auto_vacuum;').fetchone()[0]
+        if mode != 2:  # not INCREMENTAL
+            with self.tran_lock:
+                # only takes effect with the VACUUM below
+                self._putter.execute('PRAGMA auto_vacuum=INCREMENTAL;')
+            super(SQLiteBase, self).shrink_disk_usage()
+        else:
+            with self.tran_lock:
+                # executescript steps the pragma until all pages are freed
+                self._putter.executescript('PRAGMA incremental_vacuum;')
+        self.checkpoint()
+
+    def task_done(self) -> None:
+        self.flush()
+        super(SQLiteBase, self).task_done()
+
     def close(self) -> None:
         """Closes sqlite connections"""
+        if getattr(self, '_commit_stop', None) is None:
+            # `__init__` raised before the queue was set up
+            return
+        self._commit_stop.set()
+        self._put_wakeup.set()
+        if self._putter is not None:
+            self.flush()
+        if self._readers is not None:
+            while not self._readers.empty():
+                self._readers.get_nowait().close()
         if self._getter is not None:
             self._getter.close()
         if self._putter is not None:
@@ -2,13 +2,15 @@
 import logging
 import sqlite3
 import time as _time
-import threading
-from typing import Any
+from functools import cached_property
+from typing import Any, Iterable, List, Optional
 from persistqueue import sqlbase
 
-sqlite3.enable_callback_tracebacks(True)
 log = logging.getLogger(__name__)
 
+# `DELETE ... RETURNING` is only available since sqlite 3.35.0
+_DELETE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 
 class SQLiteQueue(sqlbase.SQLiteBase):
     """SQLite3 based FIFO queue."""
@@ -25,7 +27,7 @@ class SQLiteQueue(sqlbase.SQLiteBase):
     # SQL to select a record
     _SQL_SELECT_ID = (
         'SELECT {key_column}, data, timestamp FROM {table_name} WHERE'
-        ' {key_column} = {rowid}'
+        ' {key_column} = ?'
     )
     _SQL_SELECT = (
         'SELECT {key_column}, data, timestamp FROM {table_name} '
@@ -37,21 +39,128 @@ class SQLiteQueue(sqlbase.SQLiteBase):
     )
     _SQL_UPDATE = 'UPDATE {table_name} SET data = ? WHERE {key_column} = ?'
     _SQL_DELETE = 'DELETE FROM {table_name} WHERE {key_column} {op} ?'
+    # SQL to remove the next record and return it in a single statement
+    _SQL_POP = (
+        'DELETE FROM {table_name} WHERE {key_column} = ('
+        'SELECT {key_column} FROM {table_name} '
+        'ORDER BY {key_column} ASC LIMIT 1) '
+        'RETURNING {key_column}, data, timestamp'
+    )
+    # SQL to select up to `n` records for `get_many`
+    _SQL_SELECT_MANY = (
+        'SELECT {key_column}, data, timestamp FROM {table_name} '
+        'ORDER BY {key_column} ASC LIMIT ?'
+    )
+    _SQL_SELECT_MANY_AFTER = (
+        'SELECT {key_column}, data, timestamp FROM {table_name} WHERE'
+        ' {key_column} > ? ORDER BY {key_column} ASC LIMIT ?'
+    )
+    _SQL_DELETE_RANGE = (
+        'DELETE FROM {table_name} WHERE {key_column} BETWEEN ? AND ?'
+    )
 
     def put(self, item: Any, block: bool = True) -> int:
         # block kwarg is noop and only here to align with python's queue
-        obj = self._serializer.dumps(item)
-        _id = self._insert_into(obj, _time.time())
-        self.total += 1
-        self.put_event.set()
+        return self.put_raw_bytes(self._serializer.dumps(item))
+
+    def put_raw_bytes(self, data: bytes) -> Optional[int]:
+        """Put bytes already serialized with the queue's serializer."""
+        _id = self._insert_into(data, _time.time())
+        self._incr_total()
         return _id
 
+    def get_raw_bytes(self, block: bool = True,
+                      timeout: Optional[float] = None,
+                      id: Optional[int] = None) -> bytes:
+        """Get the next item as the stored bytes, without deserializing.
+
+        Together with `put_raw_bytes` this forwards items between queues
+        using the same serializer without decoding and encoding them.
+        """
+        return self._get(block, timeout, self._get_rowid(id), False,
+                         decode=False)
+
     def put_nowait(self, item: Any) -> int:
         return self.put(item, block=False)
 
+    def put_many(self, items: Iterable[Any]) -> None:
+        """Put all the items in a single transaction."""
+        dumps = self._serializer.dumps
+        now = _time.time()
+        records = [(dumps(item), now) for item in items]
+        if records:
+            self._insert_many(records)
+            self._incr_total(len(records))
+
+    def get_many(self, n: int, raw: bool = False) -> List[Any]:
+        """Get up to `n` items at once without blocking.
+
+        The rows are selected and deleted in a single transaction, an empty
+        list is returned if the queue is empty.
+        """
+        if n <= 0:
+            return []
+        with self.action_lock:
+            self._flush_for_read()
+            if self.auto_commit:
+                with self.tran_lock:
+                    with self._putter:
+                        cur = self._putter_cursor
+                        rows = cur.execute(
+                            self._sql_select_many, (n,)).fetchall()
+                        if rows:
+                            # the selected rows are contiguous in key order
+                            ids = sorted((rows[0][0], rows[-1][0]))
+                            cur.execute(self._sql_delete_range, ids)
+            else:
+                with self._acquire_reader() as reader:
+                    rows = reader.execute(
+                        self._sql_select_many_after, (self.cursor, n)
+                    ).fetchall()
+                if rows:
+                    self.cursor = rows[-1][0]
+            self.total -= len(rows)
+        return [self._load_row(row, raw) for row in rows]
+
+    def _pop(self, rowid: Optional[int] = None, raw: bool = False,
+             decode: bool = True) -> Optional[Any]:
+        self._flush_for_read()
+        if not _DELETE_RETURNING or not self.auto_commit or rowid:
+            return super(SQLiteQueue, self)._pop(rowid, raw, decode)
+        with self.tran_lock:
+            with self._putter:
+                rows = self._putter_cursor.execute(self._sql_pop).fetchall()
+        if rows and rows[0][0] is not None:
+            self.total -= 1
+            return self._load_row(rows[0], raw, decode)
+        return None
+
+    @cached_property
+    def _sql_pop(self) -> str:
+        return self._SQL_POP.format(
+            table_name=self._table_name, key_column=self._key_column
+        )
+
+    @cached_property
+    def _sql_select_many(self) -> str:
+        return self._SQL_SELECT_MANY.format(
+            table_name=self._table_name, key_column=self._key_column
+        )
+
+    @cached_property
+    def _sql_select_many_after(self) -> str:
+        return self._SQL_SELECT_MANY_AFTER.format(
+            table_name=self._table_name, key_column=self._key_column
+        )
+
+    @cached_property
+    def _sql_delete_range(self) -> str:
+        return self._SQL_DELETE_RANGE.format(
+            table_name=self._table_name, key_column=self._key_column
+        )
+
     def _init(self) -> None:
         super(SQLiteQueue, self)._init()
-        self.action_lock = threading.Lock()
         if not self.auto_commit:
             head = self._select()
             if head:
@@ -72,6 +181,16 @@ class FILOSQLiteQueue(SQLiteQueue):
         'SELECT {key_column}, data FROM {table_name} '
         'ORDER BY {key_column} DESC LIMIT 1'
     )
+    _SQL_POP = (
+        'DELETE FROM {table_name} WHERE {key_column} = ('
+        'SELECT {key_column} FROM {table_name} '
+        'ORDER BY {key_column} DESC LIMIT 1) '
+        'RETURNING {key_column}, data, timestamp'
+    )
+    _SQL_SELECT_MANY = (
+        'SELECT {key_column}, data, timestamp FROM {table_name} '
+        'ORDER BY {key_column} DESC LIMIT ?'
+    )
 
 
 class UniqueQ(SQLiteQueue):
@@ -84,12 +203,22 @@ class UniqueQ(SQLiteQueue):
 
     def put(self, item: Any) -> Any:
         obj = self._serializer.dumps(item, sort_keys=True)
+        return self.put_raw_bytes(obj)
+
+    def put_raw_bytes(self, data: bytes) -> Optional[int]:
         _id = None
         try:
-            _id = self._insert_into(obj, _time.time())
+            _id = self._insert_into(data, _time.time())
         except sqlite3.IntegrityError:
             pass
         else:
-            self.total += 1
-            self.put_event.set()
+            self._incr_total()
         return _id
+
+    def put_many(self, items: Iterable[Any]) -> None:
+        """Put the items in a single transaction, skipping duplicates."""
+        dumps = self._serializer.dumps
+        now = _time.time()
+        records = [(dumps(item, sort_keys=True), now) for item in items]
+        if records:
+            self._incr_total(self._insert_many(records, or_ignore=True))
@@ -33,20 +33,34 @@ if sys.platform.startswith('win32'):
 class MySQLQueueTest(unittest.TestCase):
     """tests that focus on feature specific to mysql"""
 
+    @classmethod
+    def setUpClass(cls):
+        # one table for the whole class, emptied after each test, which
+        # skips the CREATE/DROP TABLE round trips per test
+        cls._table_name = "%s.%s" % (cls.__name__, time.time())
+        cls._admin_queue = MySQLQueue(name=cls._table_name, **db_conf)
+
+    @classmethod
+    def tearDownClass(cls):
+        tmp_conn = cls._admin_queue.get_pooled_conn()
+        tmp_conn.cursor().execute(
+            "drop table if exists %s" % cls._admin_queue._table_name)
+        tmp_conn.commit()
+
     def setUp(self):
-        _name = self.id().split(".")[-1:]
-        _name.append(str(time.time()))
-        self._table_name = ".".join(_name)
         self.queue_class = MySQLQueue
-        self.mysql_queue = MySQLQueue(name=self._table_name,
-                                      **db_conf)
+        # reuse the class wide pool instead of connecting again per test
+        self.mysql_queue = MySQLQueue(
+            name=self._table_name,
+            connection_pool=self._admin_queue._connection_pool,
+            **db_conf)
         self.queue = self.mysql_queue
 
     def tearDown(self):
-        pass
-        tmp_conn = self.mysql_queue.get_pooled_conn()
+        # TRUNCATE also resets AUTO_INCREMENT, so ids start at 1 again
+        tmp_conn = self._admin_queue.get_pooled_conn()
         tmp_conn.cursor().execute(
-            "drop table if exists %s" % self.mysql_queue._table_name)
+            "truncate table %s" % self._admin_queue._table_name)
         tmp_conn.commit()
 
     def test_raise_empty(self):
@@ -100,8 +114,7 @@ class MySQLQueueTest(unittest.TestCase):
         """Write 1000 items, close, reopen checking if all items are there"""
 
         q = self.queue
-        for i in range(1000):
-            q.put('var%d' % i)
+        q.put_many('var%d' % i for i in range(1000))
         self.assertEqual(1000, q.qsize())
         del q
         q = MySQLQueue(name=self._table_name,
@@ -119,16 +132,17 @@ class MySQLQueueTest(unittest.TestCase):
         """Test random read/write"""
 
         q = self.queue
+        rnd = random.Random(0xC0FFEE)
         n = 0
-        for _ in range(1000):
-            if random.random() < 0.5:
+        for _ in range(200):
+            if rnd.random() < 0.5:
                 if n > 0:
                     q.get()
                     n -= 1
                 else:
                     self.assertRaises(Empty, q.get, block=False)
             else:
-                q.put('var%d' % random.getrandbits(16))
+                q.put('var%d' % rnd.getrandbits(16))
                 n += 1
 
     def test_multi_threaded_parallel(self):
@@ -186,8 +200,7 @@ class MySQLQueueTest(unittest.TestCase):
         queue = self.queue
 
         def producer():
-            for x in range(1000):
-                queue.put('var%d' % x)
+            queue.put_many('var%d' % x for x in range(1000))
 
         counter = []
         # Set all to 0
@@ -224,8 +237,7 @@ class MySQLQueueTest(unittest.TestCase):
 
         q = self.queue
 
-        for i in range(1, 11):
-            q.put(i)
+        q.put_many(range(1, 11))
 
         self.assertEqual(1, q.get())
         self.assertEqual(2, q.get())
@@ -260,12 +272,7 @@ class MySQLQueueTest(unittest.TestCase):
         self.assertEqual(5, q.get())
         self.assertEqual(5, q.qsize())
 
-    def test_protocol_1(self):
-        q = self.queue
-        self.assertEqual(q._serializer.protocol,
-                         2 if sys.version_info[0] == 2 else 4)
-
-    def test_protocol_2(self):
+    def test_protocol(self):
         q = self.queue
         self.assertEqual(q._serializer.protocol,
                          2 if sys.version_info[0] == 2 else 4)
@@ -282,6 +289,16 @@ class MySQLQueueTest(unittest.TestCase):
         q.put(x)
         self.assertEqual(q.get(), x)
 
+    def test_put_many(self):
+        q = self.queue
+        q.put('var0')
+        q.put_many('var%d' % i for i in range(1, 10))
+        q.put_many([])
+        self.assertEqual(10, q.qsize())
+        for i in range(10):
+            self.assertEqual('var%d' % i, q.get())
+        self.assertEqual(0, q.qsize())
+
     def test_put_0(self):
         q = self.queue
         q.put(0)
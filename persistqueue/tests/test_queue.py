@@ -9,12 +9,13 @@ import tempfile
 import unittest
 from collections import namedtuple
 from nose2.tools import params
-from threading import Thread
+from threading import Lock, Thread
 
 from persistqueue.serializers import json as serializers_json
 from persistqueue.serializers import pickle as serializers_pickle
 from persistqueue.serializers import msgpack as serializers_msgpack
 from persistqueue.serializers import cbor2 as serializers_cbor2
+from persistqueue.serializers import msgspec as serializers_msgspec
 
 from persistqueue import Queue, Empty, Full
 
@@ -24,6 +25,7 @@ serializer_params = {
     "serializer=json": {"serializer": serializers_json},
     "serializer=msgpack": {"serializer": serializers_msgpack},
     "serializer=cbor2": {"serializer": serializers_cbor2},
+    "serializer=msgspec": {"serializer": serializers_msgspec},
     "serializer=pickle": {"serializer": serializers_pickle},
 }
 
@@ -92,6 +94,50 @@ class PersistTest(unittest.TestCase):
         q.put('foobar')
         data = q.get()
 
+    @params(*serializer_params)
+    def test_put_many_get_many(self, serializer):
+        """Put and get 500 items in batches, across chunk files"""
+
+        q = Queue(self.path, chunksize=100, **serializer_params[serializer])
+        q.put('var0')
+        q.put_many('var%d' % i for i in range(1, 500))
+        q.put_many([])
+        self.assertEqual(500, q.qsize())
+        del q
+        q = Queue(self.path, chunksize=100, **serializer_params[serializer])
+        self.assertEqual(500, q.qsize())
+        self.assertEqual(['var%d' % i for i in range(250)], q.get_many(250))
+        self.assertEqual('var250', q.get())
+        self.assertEqual(['var%d' % i for i in range(251, 500)],
+                         q.get_many(1000))
+        self.assertEqual([], q.get_many(10))
+        for _ in range(500):
+            q.task_done()
+        q.join()
+
+    def test_put_many_full(self):
+        q = Queue(self.path, maxsize=3)
+        q.put('var1')
+        with self.assertRaises(Full):
+            q.put_many(['var2', 'var3', 'var4'])
+        q.put_many(['var2', 'var3'])
+        self.assertEqual(True, q.full())
+
+    def test_put_many_unserializable(self):
+        q = Queue(self.path)
+        q.put('var1')
+        with self.assertRaises(TypeError):
+            q.put_many(['var2', 'var3', Lock()])
+        self.assertEqual(1, q.qsize())
+        self.assertEqual(1, q.unfinished_tasks)
+        q.put_many(['var2', 'var3'])
+        del q
+        q = Queue(self.path)
+        self.assertEqual(3, q.qsize())
+        for i in range(1, 4):
+            self.assertEqual('var%d' % i, q.get())
+            q.task_done()
+
     @params(*serializer_params)
     def test_partial_write(self, serializer):
         """Test recovery from previous crash w/ partial write"""
@@ -110,14 +156,14 @@ class PersistTest(unittest.TestCase):
         with self.assertRaises(Empty):
             q.get_nowait()
 
-    @params(*serializer_params)
-    def test_random_read_write(self, serializer):
+    def test_random_read_write(self):
         """Test random read/write"""
 
-        q = Queue(self.path, **serializer_params[serializer])
+        q = Queue(self.path)
+        rnd = random.Random(0xC0FFEE)
         n = 0
-        for i in range(1000):
-            if random.random() < 0.5:
+        for i in range(200):
+            if rnd.random() < 0.5:
                 if n > 0:
                     q.get_nowait()
                     q.task_done()
@@ -126,7 +172,7 @@ class PersistTest(unittest.TestCase):
                     with self.assertRaises(Empty):
                         q.get_nowait()
             else:
-                q.put('var%d' % random.getrandbits(16))
+                q.put('var%d' % rnd.getrandbits(16))
                 n += 1
 
     @params(*serializer_params)
@@ -173,10 +219,9 @@ class PersistTest(unittest.TestCase):
         self.assertEqual('var1', q.get())
         q.task_done()
 
-    @params(*serializer_params)
-    def test_task_done_too_many_times(self, serializer):
+    def test_task_done_too_many_times(self):
         """Test too many task_done called."""
-        q = Queue(self.path, **serializer_params[serializer])
+        q = Queue(self.path)
         q.put('var1')
         q.get()
         q.task_done()
@@ -184,17 +229,15 @@ class PersistTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             q.task_done()
 
-    @params(*serializer_params)
-    def test_get_timeout_negative(self, serializer):
-        q = Queue(self.path, **serializer_params[serializer])
+    def test_get_timeout_negative(self):
+        q = Queue(self.path)
         q.put('var1')
         with self.assertRaises(ValueError):
             q.get(timeout=-1)
 
-    @params(*serializer_params)
-    def test_get_timeout(self, serializer):
+    def test_get_timeout(self):
         """Test when get failed within timeout."""
-        q = Queue(self.path, **serializer_params[serializer])
+        q = Queue(self.path)
         q.put('var1')
         q.get()
         with self.assertRaises(Empty):
@@ -208,37 +251,33 @@ class PersistTest(unittest.TestCase):
         self.assertEqual('var1', q.get())
         q.task_done()
 
-    @params(*serializer_params)
-    def test_put_maxsize_reached(self, serializer):
+    def test_put_maxsize_reached(self):
         """Test that maxsize reached."""
-        q = Queue(self.path, maxsize=10, **serializer_params[serializer])
+        q = Queue(self.path, maxsize=10)
         for x in range(10):
             q.put(x)
 
         with self.assertRaises(Full):
             q.put('full_now', block=False)
 
-    @params(*serializer_params)
-    def test_put_timeout_reached(self, serializer):
+    def test_put_timeout_reached(self):
         """Test put with block and timeout."""
-        q = Queue(self.path, maxsize=2, **serializer_params[serializer])
+        q = Queue(self.path, maxsize=2)
         for x in range(2):
             q.put(x)
 
         with self.assertRaises(Full):
             q.put('full_and_timeout', block=True, timeout=1)
 
-    @params(*serializer_params)
-    def test_put_timeout_negative(self, serializer):
+    def test_put_timeout_negative(self):
         """Test and put with timeout < 0"""
-        q = Queue(self.path, maxsize=1, **serializer_params[serializer])
+        q = Queue(self.path, maxsize=1)
         with self.assertRaises(ValueError):
             q.put('var1', timeout=-1)
 
-    @params(*serializer_params)
-    def test_put_block_and_wait(self, serializer):
+    def test_put_block_and_wait(self):
         """Test block until queue is not full."""
-        q = Queue(self.path, maxsize=10, **serializer_params[serializer])
+        q = Queue(self.path, maxsize=10)
 
         def consumer():
             for i in range(5):
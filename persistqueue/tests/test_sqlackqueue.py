@@ -12,6 +12,7 @@ from persistqueue.sqlackqueue import (
     SQLiteAckQueue,
     FILOSQLiteAckQueue,
     UniqueAckQ,
+    AckStatus,
 )
 from persistqueue import Empty
 
@@ -140,6 +141,7 @@ class SQLite3AckQueueTest(unittest.TestCase):
         queue = self.queue_class(
             path=self.path, multithreading=True, auto_commit=self.auto_commit
         )
+        result = []
 
         def producer(seq):
             for i in range(10):
@@ -147,8 +149,7 @@ class SQLite3AckQueueTest(unittest.TestCase):
 
         def consumer():
             for _ in range(100):
-                data = queue.get(block=True)
-                self.assertTrue('var' in data)
+                result.append(queue.get(block=True))
 
         c = Thread(target=consumer)
         c.start()
@@ -162,6 +163,8 @@ class SQLite3AckQueueTest(unittest.TestCase):
             t.join()
 
         c.join()
+        # the producers interleave, so only the set of items is fixed
+        self.assertEqual({'var%d' % i for i in range(100)}, set(result))
 
     def test_multiple_consumers(self):
         """Test sqlqueue can be used by multiple consumers."""
@@ -377,6 +380,36 @@ class SQLite3AckQueueTest(unittest.TestCase):
         self.assertEqual(len(d), 3)
         self.assertEqual(d[1].get("data"), "val2")
 
+    def test_put_many(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        q.put_many('val%d' % i for i in range(10))
+        self.assertEqual(10, q.qsize())
+        items = [q.get() for _ in range(10)]
+        self.assertEqual(sorted('val%d' % i for i in range(10)),
+                         sorted(items))
+        self.assertEqual(10, q.unack_count())
+
+    def test_batch_commit_multithreading(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit,
+                             multithreading=True, batch_commit_interval=5)
+        q.put('var1')
+        # the pending insert is committed before reading via _getter
+        self.assertEqual('var1', q.get_nowait())
+        self.assertEqual(1, q.unack_count())
+
+    def test_iter_queue(self):
+        q = self.queue_class(path=self.path)
+        q._QUEUE_FETCH_SIZE = 2
+        for i in range(5):
+            q.put('val%d' % i)
+        q.get()
+        items = list(q.iter_queue())
+        self.assertEqual(['val%d' % i for i in range(5)],
+                         [item.get('data') for item in items])
+        unack = [item for item in items
+                 if str(item.get('status')) == AckStatus.unack]
+        self.assertEqual(1, len(unack))
+
     def test_update(self):
         q = self.queue_class(path=self.path)
         qid = q.put("val1")
@@ -520,3 +553,12 @@ class SQLite3UniqueAckQueueTest(SQLite3AckQueueTest):
         del q
         q = self.queue_class(self.path)
         self.assertEqual(2, q.size)
+
+    def test_put_many_duplicates(self):
+        q = self.queue_class(self.path)
+        q.put(1111)
+        q.put_many([1111, 2222, 3333, 2222, {'a': 1, 'b': 2}])
+        q.put_many([{'b': 2, 'a': 1}])
+        self.assertEqual(4, q.size)
+        self.assertEqual([1111, 2222, 3333, {'a': 1, 'b': 2}],
+                         [q.get() for _ in range(4)])
@@ -1,9 +1,12 @@
 # coding=utf-8
 
+import os
 import random
 import shutil
+import sqlite3
 import sys
 import tempfile
+import time
 import unittest
 from threading import Thread
 
@@ -13,6 +16,7 @@ from persistqueue.serializers import json as serializers_json
 from persistqueue.serializers import pickle as serializers_pickle
 from persistqueue.serializers import msgpack as serializers_msgpack
 from persistqueue.serializers import cbor2 as serializers_cbor2
+from persistqueue.serializers import msgspec as serializers_msgspec
 
 
 class SQLite3QueueTest(unittest.TestCase):
@@ -90,6 +94,18 @@ class SQLite3QueueTest(unittest.TestCase):
         q.shrink_disk_usage()
         self.assertEqual('foobar', data)
 
+    def test_open_close_1000_put_many(self):
+        """Put 1000 items at once, reopen checking if all items are there"""
+
+        q = self.queue_class(self.path, auto_commit=self.auto_commit)
+        q.put_many('var%d' % i for i in range(1000))
+        self.assertEqual(1000, q.qsize())
+        del q
+        q = SQLiteQueue(self.path)
+        self.assertEqual(1000, q.qsize())
+        for i in range(1000):
+            self.assertEqual('var%d' % i, q.get())
+
     def test_random_read_write(self):
         """Test random read/write"""
 
@@ -138,14 +154,15 @@ class SQLite3QueueTest(unittest.TestCase):
         queue = self.queue_class(path=self.path, multithreading=True,
                                  auto_commit=self.auto_commit)
 
+        result = []
+
         def producer(seq):
             for i in range(10):
                 queue.put('var%d' % (i + (seq * 10)))
 
         def consumer():
             for _ in range(100):
-                data = queue.get(block=True)
-                self.assertTrue('var' in data)
+                result.append(queue.get(block=True))
 
         c = Thread(target=consumer)
         c.start()
@@ -159,6 +176,35 @@ class SQLite3QueueTest(unittest.TestCase):
             t.join()
 
         c.join()
+        # the producers interleave, so only the set of items is fixed
+        self.assertEqual({'var%d' % i for i in range(100)}, set(result))
+
+    def test_multi_threaded_put_many(self):
+        """Test put_many can be used by multiple producers."""
+        queue = self.queue_class(path=self.path, multithreading=True,
+                                 auto_commit=self.auto_commit)
+        result = []
+
+        def producer(seq):
+            for i in range(0, 100, 10):
+                queue.put_many('var%d' % (seq * 100 + j)
+                               for j in range(i, i + 10))
+
+        def consumer():
+            for _ in range(1000):
+                result.append(queue.get(block=True, timeout=10))
+
+        c = Thread(target=consumer)
+        c.start()
+        producers = [Thread(target=producer, args=(seq,))
+                     for seq in range(10)]
+        for t in producers:
+            t.start()
+        for t in producers:
+            t.join()
+        c.join()
+        self.assertEqual({'var%d' % i for i in range(1000)}, set(result))
+        self.assertEqual(0, queue.qsize())
 
     def test_multiple_consumers(self):
         """Test sqlqueue can be used by multiple consumers."""
@@ -200,6 +246,53 @@ class SQLite3QueueTest(unittest.TestCase):
 
         self.assertEqual(len(set(counter)), len(counter))
 
+    def _wait_for_get_waiter(self, queue):
+        """Wait until a consumer blocks in get() rather than a fixed time."""
+        deadline = time.time() + 5
+        while not queue._get_waiters:
+            if time.time() > deadline:
+                self.fail('the consumer did not block in get()')
+            time.sleep(0.001)
+
+    def test_get_wakeup_on_put(self):
+        """A blocked get() is woken by a put() instead of the poll tick."""
+        queue = self.queue_class(path=self.path, multithreading=True,
+                                 auto_commit=self.auto_commit)
+        result = []
+
+        def consumer():
+            result.append(queue.get(timeout=5))
+
+        c = Thread(target=consumer)
+        c.start()
+        self._wait_for_get_waiter(queue)
+        start = time.time()
+        queue.put('var1')
+        c.join()
+        self.assertEqual(['var1'], result)
+        self.assertLess(time.time() - start, 1)
+
+    def test_get_wakeup_on_other_connection_put(self):
+        """A blocked get() picks up a put by another process quickly."""
+        if self.path == ':memory:':
+            self.skipTest('Memory based sqlite is not shared.')
+        queue = self.queue_class(path=self.path, multithreading=True,
+                                 auto_commit=self.auto_commit)
+        result = []
+
+        def consumer():
+            result.append(queue.get(timeout=5))
+
+        c = Thread(target=consumer)
+        c.start()
+        self._wait_for_get_waiter(queue)
+        start = time.time()
+        # another queue object stands in for another process
+        self.queue_class(path=self.path).put('var1')
+        c.join()
+        self.assertEqual(['var1'], result)
+        self.assertLess(time.time() - start, 1)
+
     def test_task_done_with_restart(self):
         """Test that items are not deleted before task_done."""
 
@@ -251,6 +344,250 @@ class SQLite3QueueTest(unittest.TestCase):
         q.put(x)
         self.assertEqual(q.get(), x)
 
+    def test_msgspec_serializer(self):
+        q = self.queue_class(
+            path=self.path,
+            serializer=serializers_msgspec)
+        x = dict(
+            a=1,
+            b=b'\x00\x01',
+            c=dict(
+                d=list(range(5)),
+                e=[1]
+            ))
+        q.put(x)
+        q.put('str1')
+        self.assertEqual(2, len(q.queue()))
+        self.assertEqual(q.get(), x)
+        self.assertEqual(q.get(), 'str1')
+
+    def test_batch_commit(self):
+        if self.path == ":memory:":
+            self.skipTest('Memory based sqlite is not shared.')
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit,
+                             batch_commit_interval=3600,
+                             batch_commit_size=5)
+        for i in range(3):
+            q.put('var%d' % i)
+        self.assertEqual(3, q.qsize())
+        # the batch is not committed yet, other connections can not see it
+        self.assertEqual(0, SQLiteQueue(self.path)._count())
+        q.flush()
+        self.assertEqual(3, SQLiteQueue(self.path)._count())
+        for i in range(3, 8):
+            q.put('var%d' % i)
+        # reaching batch_commit_size commits the batch
+        self.assertEqual(8, SQLiteQueue(self.path)._count())
+        q.put('var8')
+        q.close()
+        q = SQLiteQueue(self.path)
+        self.assertEqual(9, q.qsize())
+        for i in range(9):
+            self.assertEqual('var%d' % i, q.get())
+
+    def test_batch_commit_interval(self):
+        if self.path == ":memory:":
+            self.skipTest('Memory based sqlite is not shared.')
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit,
+                             batch_commit_interval=0.01)
+        q.put('var1')
+        other = SQLiteQueue(self.path)
+        for _ in range(500):
+            if other._count():
+                break
+            time.sleep(0.01)
+        self.assertEqual(1, other._count())
+        self.assertEqual('var1', q.get())
+
+    def test_batch_commit_multithreading(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit,
+                             multithreading=True, batch_commit_interval=5)
+        q.put('var1')
+        # the pending inserts are committed before reading via a reader
+        self.assertEqual('var1', q.get_nowait())
+        q.put_many(['var2', 'var3'])
+        q.put('var4')
+        self.assertEqual(['var2', 'var3', 'var4'], q.get_many(10))
+        q.task_done()
+
+    def test_shrink_disk_usage(self):
+        if self.path == ':memory:':
+            self.skipTest('Memory based sqlite has no file to shrink.')
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        db_file = os.path.join(self.path, q.db_file_name)
+        for i in range(1000):
+            q.put(os.urandom(1024))
+        q.checkpoint()
+        self.assertEqual(0, os.path.getsize(db_file + '-wal'))
+        size = os.path.getsize(db_file)
+        for i in range(1000):
+            q.get()
+        q.task_done()
+        q.shrink_disk_usage()
+        self.assertEqual(
+            0, q._putter.execute('PRAGMA freelist_count').fetchone()[0])
+        self.assertLess(os.path.getsize(db_file), size)
+        self.assertEqual(0, os.path.getsize(db_file + '-wal'))
+
+    def test_shrink_disk_usage_legacy_db(self):
+        if self.path == ':memory:':
+            self.skipTest('Memory based sqlite has no file to shrink.')
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit,
+                             sqlite_pragmas={'auto_vacuum': 'NONE'})
+        q.close()
+        # auto_vacuum is not changed on an existing database file
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        self.assertEqual(
+            0, q._putter.execute('PRAGMA auto_vacuum').fetchone()[0])
+        q.put('var1')
+        q.shrink_disk_usage()
+        self.assertEqual(
+            2, q._putter.execute('PRAGMA auto_vacuum').fetchone()[0])
+        q.shrink_disk_usage()
+        self.assertEqual(
+            2, q._putter.execute('PRAGMA auto_vacuum').fetchone()[0])
+        self.assertEqual('var1', q.get())
+
+    def test_checkpoint_mode(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        q.checkpoint('PASSIVE')
+        self.assertRaises(ValueError, q.checkpoint, 'TRUNCATE; DROP')
+
+    def test_put_many(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        q.put('var0')
+        q.put_many('var%d' % i for i in range(1, 100))
+        q.put_many([])
+        self.assertEqual(100, q.qsize())
+        for i in range(100):
+            self.assertEqual('var%d' % i, q.get())
+        q.task_done()
+        self.assertEqual(0, q.qsize())
+
+    def test_get_many(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        self.assertEqual([], q.get_many(10))
+        q.put_many('var%d' % i for i in range(100))
+        self.assertEqual([], q.get_many(0))
+        self.assertEqual(['var%d' % i for i in range(30)], q.get_many(30))
+        self.assertEqual(70, q.qsize())
+        items = q.get_many(10, raw=True)
+        self.assertEqual(['var%d' % i for i in range(30, 40)],
+                         [item['data'] for item in items])
+        self.assertEqual('var40', q.get())
+        self.assertEqual(['var%d' % i for i in range(41, 100)],
+                         q.get_many(100))
+        self.assertEqual(0, q.qsize())
+        q.task_done()
+        del q
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        self.assertEqual(0, q.qsize())
+        self.assertEqual([], q.get_many(10))
+
+    def test_raw_bytes(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        other = self.queue_class(path=self.path, name='other',
+                                 auto_commit=self.auto_commit)
+        q.put({'a': 1})
+        q.put('var2')
+        data = q.get_raw_bytes()
+        self.assertEqual(serializers_pickle.dumps({'a': 1}), data)
+        # forward the stored bytes as they are
+        other.put_raw_bytes(data)
+        self.assertEqual({'a': 1}, other.get())
+        self.assertEqual(1, q.qsize())
+        self.assertRaises(Empty, other.get_raw_bytes, block=False)
+
+    def test_put_buffer(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit,
+                             put_buffer_size=3)
+        self.assertIsNone(q.put('var1'))
+        q.put('var2')
+        self.assertEqual(2, q.qsize())
+        # the buffered puts are written before popping
+        self.assertEqual('var1', q.get())
+        for i in range(3, 8):
+            q.put('var%d' % i)
+        q.flush()
+        self.assertEqual(0, len(q._put_buffer))
+        self.assertEqual(6, q.qsize())
+        self.assertEqual('var2', q.get())
+        q.task_done()
+
+    def test_reader_pool(self):
+        if self.path == ':memory:':
+            self.skipTest('The reader pool is only used on disk.')
+        q = self.queue_class(path=self.path, multithreading=True,
+                             reader_pool_size=2)
+        for i in range(3):
+            q.put('var%d' % i)
+        # concurrent iterations run on separate read-only connections
+        it1 = q.iter_queue()
+        it2 = q.iter_queue()
+        self.assertEqual('var0', next(it1)['data'])
+        self.assertEqual('var0', next(it2)['data'])
+        with q._acquire_reader() as reader:
+            self.assertIsNot(reader, q._putter)
+            self.assertRaises(sqlite3.OperationalError, reader.execute,
+                              q._sql_delete('>='), (0,))
+        self.assertEqual(2, len(list(it1)))
+        self.assertEqual(2, len(list(it2)))
+        self.assertEqual(2, q._readers.qsize())
+        self.assertEqual('var0', q.get())
+        self.assertEqual(2, q.qsize())
+        q.close()
+
+    def test_sqlite_pragmas(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        self.assertEqual(
+            1, q._putter.execute('PRAGMA synchronous').fetchone()[0])
+        self.assertEqual(
+            -65536, q._putter.execute('PRAGMA cache_size').fetchone()[0])
+        q.close()
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit,
+                             sqlite_pragmas={'synchronous': 'FULL'})
+        self.assertEqual(
+            2, q._putter.execute('PRAGMA synchronous').fetchone()[0])
+        q.put('var1')
+        self.assertEqual('var1', q.get())
+
+    def test_msgpack_serializer(self):
+        q = self.queue_class(path=self.path, multithreading=True,
+                             auto_commit=self.auto_commit,
+                             serializer=serializers_msgpack)
+        # an item msgpack cannot serialize must not leak into the next one
+        self.assertRaises(TypeError, q.put, object())
+
+        def producer(seq):
+            for i in range(100):
+                q.put({'seq': seq, 'i': i})
+
+        threads = [Thread(target=producer, args=(seq,)) for seq in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        items = [q.get() for _ in range(400)]
+        self.assertEqual(
+            sorted((item['seq'], item['i']) for item in items),
+            [(seq, i) for seq in range(4) for i in range(100)])
+
+    def test_secure_delete_off(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        self.assertEqual(0, q._putter.execute(
+            'PRAGMA secure_delete').fetchone()[0])
+
+    def test_durability(self):
+        for durability, synchronous in (('full', 2), ('off', 0)):
+            q = self.queue_class(path=self.path,
+                                 auto_commit=self.auto_commit,
+                                 durability=durability)
+            self.assertEqual(synchronous, q._putter.execute(
+                'PRAGMA synchronous').fetchone()[0])
+            q.close()
+        self.assertRaises(ValueError, self.queue_class, path=self.path,
+                          durability='paranoid')
+
     def test_put_0(self):
         q = self.queue_class(path=self.path)
         q.put(0)
@@ -268,6 +605,14 @@ class SQLite3QueueTest(unittest.TestCase):
         # item should get val2
         self.assertEqual(item, 'val2')
 
+    def test_get_id_bound_parameter(self):
+        q = self.queue_class(path=self.path, auto_commit=self.auto_commit)
+        ids = [q.put('var%d' % i) for i in range(3)]
+        # the rowid is bound as a parameter, the statement is formatted once
+        self.assertEqual('var2', q.get(id=ids[2]))
+        self.assertEqual('var1', q.get(id=ids[1]))
+        self.assertNotIn(str(ids[1]), q._sql_select_id)
+
     def test_get_raw(self):
         q = self.queue_class(path=self.path)
         q.put("val1")
@@ -286,6 +631,16 @@ class SQLite3QueueTest(unittest.TestCase):
         self.assertEqual(len(d), 3)
         self.assertEqual(d[1].get("data"), "val2")
 
+    def test_iter_queue(self):
+        q = self.queue_class(path=self.path)
+        q._QUEUE_FETCH_SIZE = 2
+        for i in range(5):
+            q.put('val%d' % i)
+        items = q.iter_queue()
+        self.assertEqual('val0', next(items).get('data'))
+        self.assertEqual(['val%d' % i for i in range(1, 5)],
+                         [item.get('data') for item in items])
+
     def test_update(self):
         q = self.queue_class(path=self.path)
         qid = q.put("val1")
@@ -330,6 +685,9 @@ class SQLite3QueueInMemory(SQLite3QueueTest):
     def test_open_close_single(self):
         self.skipTest('Memory based sqlite is not persistent.')
 
+    def test_open_close_1000_put_many(self):
+        self.skipTest('Memory based sqlite is not persistent.')
+
     def test_multiple_consumers(self):
         self.skipTest(self.skipstr)
 
@@ -339,6 +697,9 @@ class SQLite3QueueInMemory(SQLite3QueueTest):
     def test_multi_threaded_parallel(self):
         self.skipTest(self.skipstr)
 
+    def test_get_wakeup_on_put(self):
+        self.skipTest(self.skipstr)
+
     def test_task_done_with_restart(self):
         self.skipTest('Skipped due to not persistent.')
 
@@ -373,6 +734,22 @@ class FILOSQLite3QueueTest(unittest.TestCase):
         data = q.get()
         self.assertEqual('foobar', data)
 
+    def test_get_many(self):
+        q = FILOSQLiteQueue(self.path)
+        q.put_many('var%d' % i for i in range(10))
+        self.assertEqual(['var9', 'var8', 'var7'], q.get_many(3))
+        self.assertEqual('var6', q.get())
+        self.assertEqual(6, q.qsize())
+
+    def test_get_raw(self):
+        q = FILOSQLiteQueue(self.path)
+        q.put('val1')
+        val2_id = q.put('val2')
+        item = q.get(raw=True)
+        self.assertEqual(val2_id, item.get('pqid'))
+        self.assertEqual('val2', item.get('data'))
+        self.assertEqual(1, q.qsize())
+
 
 class FILOSQLite3QueueNoAutoCommitTest(FILOSQLite3QueueTest):
     def setUp(self):
@@ -402,6 +779,24 @@ class SQLite3UniqueQueueTest(unittest.TestCase):
         q = UniqueQ(self.path)
         self.assertEqual(2, q.size)
 
+    def test_put_many_duplicates(self):
+        q = UniqueQ(self.path)
+        q.put(1111)
+        q.put_many([1111, 2222, 3333, 2222, {'a': 1, 'b': 2}])
+        q.put_many([{'b': 2, 'a': 1}])
+        self.assertEqual(4, q.size)
+        self.assertEqual([1111, 2222, 3333, {'a': 1, 'b': 2}],
+                         [q.get() for _ in range(4)])
+        self.assertEqual(0, q.size)
+
+    def test_add_duplicate_item_buffered(self):
+        q = UniqueQ(self.path, put_buffer_size=10)
+        for item in (1111, 2222, 1111, 3333, 2222):
+            q.put(item)
+        q.flush()
+        self.assertEqual(3, q.size)
+        self.assertEqual([1111, 2222, 3333], [q.get() for _ in range(3)])
+
     def test_multiple_consumers(self):
         """Test UniqueQ can be used by multiple consumers."""
 
@@ -489,3 +884,15 @@ class SQLite3UniqueQueueTest(unittest.TestCase):
         self.assertEqual(queue.total, 1)
         queue.put({"bar": 2, "foo": 1})
         self.assertEqual(queue.total, 1)
+
+    def test_unique_dictionary_serialization_msgspec(self):
+        queue = UniqueQ(
+            path=self.path,
+            multithreading=True,
+            auto_commit=self.auto_commit,
+            serializer=serializers_msgspec
+        )
+        queue.put({"foo": 1, "bar": 2})
+        self.assertEqual(queue.total, 1)
+        queue.put({"bar": 2, "foo": 1})
+        self.assertEqual(queue.total, 1)